@@ -10,10 +10,20 @@ from scraper_service import (
     get_transcript,
     get_transcript_by_url,
     extract_transcript_text,
+    detect_platform_from_url,
 )
+from export_service import EXPORT_ROOT, is_columnar_export_available
+from export_ui import finish_parquet_export, open_parquet_export, write_parquet_row
+from video_records import records_from_search_results
 
 # --- 定数 ---
 SEARCH_LIMIT = 20
+# 表示名 -> VideoRecordの数値属性（Noneは検索結果の順序のまま）
+SORT_OPTIONS = {
+    "Relevance": None,
+    "Views": "view_count",
+    "Subscribers": "subscriber_count",
+}
 TRANSCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'transcripts')
 os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
 
@@ -44,17 +54,38 @@ with col_opt3:
 opt_retry_wait = st.slider("リトライ間隔(秒)", min_value=0.0, max_value=10.0, value=1.5, step=0.5)
 default_filename = datetime.now().strftime("bulk_transcripts_%Y%m%d_%H%M%S.txt")
 bulk_out_name = st.text_input("保存ファイル名（ダウンロード名）", value=default_filename)
+col_pq1, col_pq2 = st.columns([1, 2])
+with col_pq1:
+    export_parquet = st.checkbox(
+        "Parquetでもエクスポート",
+        value=False,
+        disabled=not is_columnar_export_available(),
+        help=None if is_columnar_export_available() else "pyarrow が未インストールだよ。",
+    )
+with col_pq2:
+    parquet_dataset_name = st.text_input(
+        "Parquetデータセット名（任意・platform/fetch_date で分割）",
+        value="",
+        disabled=not export_parquet,
+        help=f"{EXPORT_ROOT} 配下に作成・追記するよ。",
+    )
 if st.button("一括文字起こしを実行"):
     urls = [u.strip() for u in bulk_urls_text.splitlines() if u.strip()]
+    parquet_writer = open_parquet_export(parquet_dataset_name) if urls and export_parquet else None
     if not urls:
         st.warning("URLを1つ以上入力してね。")
+    elif export_parquet and parquet_writer is None:
+        pass  # 準備エラーは open_parquet_export が表示済み
     else:
         progress = st.progress(0)
         status = st.empty()
         results = []
         csv_rows = []
         for idx, url in enumerate(urls):
+            platform = detect_platform_from_url(url) or ""
             status.text(f"({idx+1}/{len(urls)}) 取得中: {url[:80]}")
+            data = None
+            fetch_error = None
             try:
                 data = get_transcript_by_url(
                     url, hl=opt_hl, gl=opt_gl, max_retries=opt_retries, retry_wait_sec=opt_retry_wait
@@ -67,16 +98,18 @@ if st.button("一括文字起こしを実行"):
                         f"--- START TRANSCRIPT ---\n\n"
                     )
                     results.append(header + text + "\n\n")
-                    csv_rows.append([url, "", "OK", len(text)])
+                    csv_rows.append([url, platform, "OK", len(text)])
                 else:
                     results.append(f"URL: {url}\nERROR: Transcript not found or invalid response.\n\n")
-                    csv_rows.append([url, "", "ERROR", 0])
+                    csv_rows.append([url, platform, "ERROR", 0])
             except Exception as e:
+                fetch_error = str(e)
                 results.append(f"URL: {url}\nERROR: {e}\n\n")
-                csv_rows.append([url, "", "ERROR", 0])
+                csv_rows.append([url, platform, "ERROR", 0])
                 with st.expander("デバッグ：例外詳細", expanded=True):
                     st.write(url)
                     st.exception(e)
+            parquet_writer = write_parquet_row(parquet_writer, url, data, error=fetch_error)
             progress.progress((idx+1)/len(urls))
 
         if results:
@@ -97,6 +130,9 @@ if st.button("一括文字起こしを実行"):
                 file_name=re.sub(r'[\\/*?:"<>|]', "", bulk_out_name.replace('.txt', '_summary.csv')),
                 mime="text/csv",
             )
+            finish_parquet_export(
+                parquet_writer, re.sub(r'[\\/*?:"<>|]', "", bulk_out_name.replace('.txt', '.parquet'))
+            )
             with st.expander("デバッグ：処理ログと先頭プレビュー"):
                 st.text("\n".join([r[:200] for r in results[:3]]))
         else:
@@ -149,27 +185,10 @@ if st.button("Search"):
 
                 # 正常に宝箱（辞書型）が返ってきた場合の処理
                 elif search_results and isinstance(search_results, dict) and 'videos' in search_results:
-                    video_list = search_results.get('videos', [])
-                    channel_list = search_results.get('channels', [])
-
-                    # チャンネルIDをキーとして購読者数を持つ辞書（ルックアップテーブル）を作成
-                    channel_subscribers = {c.get('id'): c.get('subscriberCountText', 'N/A') for c in channel_list if isinstance(c, dict)}
-
-                    if not video_list:
-                        st.session_state.videos = []
-                    else:
-                        enriched_videos = []
-                        for video in video_list:
-                            if not isinstance(video, dict):
-                                continue
-
-                            # 作成したルックアップテーブルから購読者数を効率的に取得
-                            channel_id = video.get('channel', {}).get('id')
-                            subscriber_count = channel_subscribers.get(channel_id, 'N/A')
-                            video['channel_details'] = {'subscriberCountText': subscriber_count}
-                            enriched_videos.append(video)
-
-                        st.session_state.videos = enriched_videos
+                    # 生のAPIレスポンスは保持せず、必要な項目だけの軽量レコードに一度だけ変換
+                    records = records_from_search_results(search_results)
+                    st.session_state.videos = records
+                    if records:
                         st.success("All video details loaded!")
 
                 else: # 検索結果が空、または予期しない形式だった場合
@@ -199,32 +218,45 @@ if st.session_state.get("videos") is not None:
     if not videos:
         st.info("No videos found.")
     else:
-        st.write(f"Found {len(videos)} videos.")
+        col_sort, col_min_views = st.columns([1, 1])
+        with col_sort:
+            sort_key = st.selectbox("Sort by", list(SORT_OPTIONS), index=0, key="sort_key")
+        with col_min_views:
+            min_views = st.number_input("Minimum views", min_value=0, value=0, step=1000, key="min_views")
+
+        # 数値はレコード生成時にパース済みなので、並べ替え・絞り込みは安価
+        if min_views:
+            videos = [v for v in videos if (v.view_count or 0) >= min_views]
+        sort_attr = SORT_OPTIONS[sort_key]
+        if sort_attr:
+            videos = sorted(videos, key=lambda v: getattr(v, sort_attr) or 0, reverse=True)
+
+        st.write(f"Found {len(st.session_state.videos)} videos." + (f" Showing {len(videos)}." if min_views else ""))
         for i, video in enumerate(videos):
             st.write("---")
             col1, col2 = st.columns([1, 4])
 
             with col1:
-                thumbnail_url = video.get("thumbnail")
-                if thumbnail_url and isinstance(thumbnail_url, str):
-                    st.image(thumbnail_url, width=160)
+                if video.thumbnail:
+                    st.image(video.thumbnail, width=160)
                 else:
                     st.image("https://via.placeholder.com/160x90.png?text=No+Thumbnail", width=160)
 
             with col2:
-                title = video.get('title', 'No Title')
-                url = video.get('url', '#')
-                channel_name = video.get('channel', {}).get('title', 'N/A')
-                view_count = video.get('viewCountText', 'N/A')
-                published_date = video.get('publishedTimeText', 'N/A')
-                # チャンネル詳細から購読者数を取得
-                subscriber_count = video.get('channel_details', {}).get('subscriberCountText', 'N/A')
+                title = video.title
+                url = video.url
+                channel_name = video.channel_title
+                view_count = video.view_count_text
+                published_date = video.published_time_text
+                subscriber_count = video.subscriber_count_text
 
                 st.subheader(f"{i + 1}. {title}")
                 st.caption(f"**Channel:** {channel_name} | **Subscribers:** {subscriber_count} | **Views:** {view_count} | **Uploaded:** {published_date}")
                 st.caption(f"**URL:** {url}")
 
-                if st.button("Download Transcript", key=f"download_{i}"):
+                # 同じ動画が重複して返っても一意になるよう表示順も含める
+                video_key = f"{video.video_id}_{i}"
+                if st.button("Download Transcript", key=f"download_{video_key}"):
                     with st.spinner(f"Downloading transcript for '{title[:30]}...'"):
                         # 言語オプション（簡易）。必要ならUIに昇格可能
                         transcript_data = None
@@ -273,7 +305,7 @@ if st.session_state.get("videos") is not None:
                                 data=full_content,
                                 file_name=filename,
                                 mime="text/plain",
-                                key=f"dl_{i}"
+                                key=f"dl_{video_key}"
                             )
                         else:
                             st.error("Could not retrieve transcript for this video.")
@@ -284,14 +316,32 @@ if st.session_state.get("videos") is not None:
 if st.session_state.get("videos"):
     st.write("---")
     st.header("Bulk Download")
+    search_export_parquet = st.checkbox(
+        "Export Parquet as well",
+        value=False,
+        disabled=not is_columnar_export_available(),
+        key="search_export_parquet",
+    )
+    search_parquet_dataset_name = st.text_input(
+        "Append to Parquet dataset (optional, partitioned by platform/fetch_date)",
+        value="",
+        disabled=not search_export_parquet,
+        key="search_parquet_dataset_name",
+        help=f"Created under {EXPORT_ROOT}.",
+    )
     if st.button("Download All Transcripts"):
+        parquet_writer = None
+        if search_export_parquet:
+            parquet_writer = open_parquet_export(search_parquet_dataset_name, lang="en")
+            if parquet_writer is None:
+                st.stop()
         all_transcripts_content = []
         bulk_progress = st.progress(0)
         bulk_status = st.empty()
 
         for i, video in enumerate(st.session_state.videos):
-            title = video.get('title', 'No Title')
-            url = video.get('url', '#')
+            title = video.title
+            url = video.url
             bulk_status.text(f"Downloading transcript for '{title[:30]}...' ({i+1}/{len(st.session_state.videos)})")
             # Bulk download also respects settings
             opt_hl = st.session_state.get("opt_hl", "ja")
@@ -306,12 +356,24 @@ if st.session_state.get("videos"):
                 retry_wait_sec=opt_retry_wait,
             )
             transcript_text = extract_transcript_text(transcript_data) if isinstance(transcript_data, dict) else None
-            
+            channel_name = video.channel_title
+            view_count = video.view_count_text
+            subscriber_count = video.subscriber_count_text
+            published_date = video.published_time_text
+            parquet_writer = write_parquet_row(
+                parquet_writer,
+                url,
+                transcript_data,
+                lang="en",
+                video_id=video.video_id,
+                title=title,
+                channel=channel_name,
+                subscriber_count_text=subscriber_count,
+                view_count_text=view_count,
+                published_time_text=published_date,
+            )
+
             if transcript_text:
-                channel_name = video.get('channel', {}).get('title', 'N/A')
-                view_count = video.get('viewCountText', 'N/A')
-                subscriber_count = video.get('channel_details', {}).get('subscriberCountText', 'N/A')
-                published_date = video.get('publishedTimeText', 'N/A')
                 download_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 header = (
                     f"--- Video {i+1} ---\n"
@@ -327,10 +389,10 @@ if st.session_state.get("videos"):
                 all_transcripts_content.append(header + transcript_text + "\n\n")
             bulk_progress.progress((i+1)/len(st.session_state.videos))
 
+        keyword = st.session_state.last_keyword
+        safe_keyword = re.sub(r'[\\/*?:"<>|]', "", keyword)
         if all_transcripts_content:
             combined_content = "".join(all_transcripts_content)
-            keyword = st.session_state.last_keyword
-            safe_keyword = re.sub(r'[\\/*?:"<>|]', "", keyword)
             filename = f"Bulk_{safe_keyword}_transcripts.txt"
             filepath = os.path.join(TRANSCRIPTS_DIR, filename)
 
@@ -346,4 +408,6 @@ if st.session_state.get("videos"):
                 mime="text/plain"
             )
         else:
-            bulk_status.error("No transcripts could be downloaded.") 
\ No newline at end of file
+            bulk_status.error("No transcripts could be downloaded.")
+
+        finish_parquet_export(parquet_writer, f"Bulk_{safe_keyword}_transcripts.parquet", lang="en")
@@ -0,0 +1,203 @@
+import os
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from scraper_service import (
+    detect_platform_from_url,
+    extract_video_id,
+    extract_transcript_segments,
+    extract_transcript_text,
+)
+
+try:
+    import pyarrow as pa  # Optional: required only for columnar export
+    import pyarrow.parquet as pq
+except Exception:
+    pa = None
+    pq = None
+
+DEFAULT_ROW_GROUP_SIZE = 10_000
+DEFAULT_PARTITION_COLS = ("platform", "fetch_date")
+# Parquetデータセットの追記先はこの配下に限定（環境変数で変更可）
+EXPORT_ROOT = os.getenv("PARQUET_EXPORT_ROOT") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+
+EXPORT_COLUMNS = [
+    "video_id",
+    "platform",
+    "url",
+    "title",
+    "channel",
+    "subscriber_count_text",
+    "view_count_text",
+    "published_time_text",
+    "fetched_at",
+    "fetch_date",
+    "status",
+    "error",
+    "transcript_text",
+    "transcript_segments",
+]
+
+
+def is_columnar_export_available() -> bool:
+    return pa is not None and pq is not None
+
+
+def _export_schema():
+    return pa.schema([
+        ("video_id", pa.string()),
+        ("platform", pa.string()),
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("channel", pa.string()),
+        ("subscriber_count_text", pa.string()),
+        ("view_count_text", pa.string()),
+        ("published_time_text", pa.string()),
+        ("fetched_at", pa.timestamp("us", tz="UTC")),
+        ("fetch_date", pa.string()),
+        ("status", pa.string()),
+        ("error", pa.string()),
+        ("transcript_text", pa.string()),
+        ("transcript_segments", pa.list_(pa.struct([
+            ("text", pa.string()),
+            ("start_ms", pa.int64()),
+            ("end_ms", pa.int64()),
+        ]))),
+    ])
+
+
+def resolve_dataset_dir(dataset_name: Optional[str]) -> Optional[str]:
+    """
+    Maps a user-supplied dataset name to a directory under EXPORT_ROOT.
+    Absolute paths and ".." components are rejected with ValueError.
+    """
+    dataset_name = (dataset_name or "").strip()
+    if not dataset_name:
+        return None
+    parts = re.split(r"[\\/]", dataset_name)
+    if os.path.isabs(dataset_name) or os.path.splitdrive(dataset_name)[0] or ".." in parts:
+        raise ValueError(f"Dataset name must be a relative path without '..': {dataset_name}")
+    root = os.path.realpath(EXPORT_ROOT)
+    path = os.path.realpath(os.path.join(root, *[p for p in parts if p]))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Dataset name resolves outside the export root: {dataset_name}")
+    return path
+
+
+def build_export_row(
+    url: str,
+    transcript_data: Any = None,
+    error: Optional[str] = None,
+    status: Optional[str] = None,
+    video_id: Optional[str] = None,
+    title: Optional[str] = None,
+    channel: Optional[str] = None,
+    subscriber_count_text: Optional[str] = None,
+    view_count_text: Optional[str] = None,
+    published_time_text: Optional[str] = None,
+    fetched_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Builds one export row from a transcript API response plus optional
+    search-result metadata. Status defaults to OK/ERROR based on whether
+    transcript text could be extracted; error carries the failure detail
+    (an exception message, or the API's error string).
+    """
+    platform = detect_platform_from_url(url)
+    fetched_at = fetched_at or datetime.now(timezone.utc)
+    text = extract_transcript_text(transcript_data) if isinstance(transcript_data, dict) else None
+    segments = extract_transcript_segments(transcript_data) if isinstance(transcript_data, dict) else None
+    if error is None and not text:
+        error = transcript_data if isinstance(transcript_data, str) else "Transcript not found or invalid response."
+    return {
+        "video_id": video_id or extract_video_id(url, platform),
+        "platform": platform,
+        "url": url,
+        "title": title,
+        "channel": channel,
+        "subscriber_count_text": subscriber_count_text,
+        "view_count_text": view_count_text,
+        "published_time_text": published_time_text,
+        "fetched_at": fetched_at,
+        "fetch_date": fetched_at.strftime("%Y-%m-%d"),
+        "status": status or ("OK" if text else "ERROR"),
+        "error": error,
+        "transcript_text": text,
+        "transcript_segments": segments,
+    }
+
+
+class ColumnarExportWriter:
+    """
+    Streams export rows into a Parquet file, flushing a row group every
+    row_group_size rows, and on close() appends the whole run to a partitioned
+    Parquet dataset under EXPORT_ROOT (one file per partition per run, so the
+    dataset does not fill up with small files; an interrupted run appends
+    nothing).
+
+    The download file is held in an in-memory buffer (st.download_button needs
+    the bytes); close() returns them. A failed dataset append does not fail
+    close(): the error is kept in dataset_error.
+    """
+
+    def __init__(
+        self,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        dataset_name: Optional[str] = None,
+        partition_cols: Sequence[str] = DEFAULT_PARTITION_COLS,
+    ):
+        if not is_columnar_export_available():
+            raise RuntimeError("pyarrow is not installed. Please run `pip install pyarrow`.")
+        self.row_group_size = max(1, int(row_group_size))
+        self.dataset_root = resolve_dataset_dir(dataset_name)
+        self.dataset_error: Optional[Exception] = None
+        self.partition_cols = list(partition_cols)
+        self.schema = _export_schema()
+        self.rows_written = 0
+        self.dataset_rows_written = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._sink = pa.BufferOutputStream()
+        self._writer = pq.ParquetWriter(self._sink, self.schema, compression="zstd")
+        if self.dataset_root:
+            os.makedirs(self.dataset_root, exist_ok=True)
+            if not os.access(self.dataset_root, os.W_OK):
+                raise PermissionError(f"Dataset directory is not writable: {self.dataset_root}")
+
+    def write_row(self, row: Dict[str, Any]):
+        self._pending.append(row)
+        if len(self._pending) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        # Take the batch first so a failure below never re-writes it on the next flush
+        rows, self._pending = self._pending, []
+        table = pa.Table.from_pylist(rows, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows_written += len(rows)
+
+    def close(self) -> bytes:
+        self.flush()
+        self._writer.close()
+        buffer = self._sink.getvalue()
+        if self.dataset_root and self.rows_written:
+            self._append_to_dataset(pq.read_table(pa.BufferReader(buffer)))
+        return buffer.to_pybytes()
+
+    def _append_to_dataset(self, table):
+        # Unique per run so appends never overwrite earlier files in the dataset
+        basename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet"
+        try:
+            pq.write_to_dataset(
+                table,
+                root_path=self.dataset_root,
+                partition_cols=self.partition_cols,
+                basename_template=basename,
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            self.dataset_rows_written = table.num_rows
+        except Exception as e:
+            self.dataset_error = e
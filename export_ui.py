@@ -0,0 +1,72 @@
+import streamlit as st
+from typing import Any, Optional
+
+from export_service import ColumnarExportWriter, build_export_row
+
+# UI文言（一括フォームは日本語、検索のBulk Downloadは英語）
+_MESSAGES = {
+    "ja": {
+        "setup_error": "Parquetエクスポートを準備できなかったよ: {error}",
+        "write_error": "Parquetへの書き込みに失敗したよ（以降のParquet出力は中止）: {error}",
+        "close_error": "Parquetファイルを作成できなかったよ: {error}",
+        "download": "Parquetをダウンロード",
+        "dataset_error": "Parquetデータセットへの追記に失敗したよ: {error}",
+        "dataset_ok": "Parquetデータセットに {rows} 件追記したよ: {path}",
+    },
+    "en": {
+        "setup_error": "Could not set up Parquet export: {error}",
+        "write_error": "Parquet write failed; skipping Parquet output for the rest of this run: {error}",
+        "close_error": "Could not build the Parquet file: {error}",
+        "download": "Download Parquet",
+        "dataset_error": "Appending to the Parquet dataset failed: {error}",
+        "dataset_ok": "Appended {rows} rows to Parquet dataset: {path}",
+    },
+}
+
+
+def open_parquet_export(dataset_name: str, lang: str = "ja") -> Optional[ColumnarExportWriter]:
+    """Creates the writer; on failure shows st.error and returns None."""
+    try:
+        return ColumnarExportWriter(dataset_name=dataset_name)
+    except Exception as e:
+        st.error(_MESSAGES[lang]["setup_error"].format(error=e))
+        return None
+
+
+def write_parquet_row(
+    writer: Optional[ColumnarExportWriter], url: str, transcript_data: Any = None, lang: str = "ja", **row_fields
+) -> Optional[ColumnarExportWriter]:
+    """
+    Writes one export row. Returns the writer, or None (after st.error) when
+    the write failed so the caller stops exporting for the rest of the run.
+    """
+    if writer is None:
+        return None
+    try:
+        writer.write_row(build_export_row(url, transcript_data, **row_fields))
+        return writer
+    except Exception as e:
+        st.error(_MESSAGES[lang]["write_error"].format(error=e))
+        return None
+
+
+def finish_parquet_export(writer: Optional[ColumnarExportWriter], file_name: str, lang: str = "ja"):
+    """Closes the writer, shows the download button and reports the dataset append."""
+    if writer is None:
+        return
+    messages = _MESSAGES[lang]
+    try:
+        parquet_bytes = writer.close()
+    except Exception as e:
+        st.error(messages["close_error"].format(error=e))
+        return
+    st.download_button(
+        label=messages["download"],
+        data=parquet_bytes,
+        file_name=file_name,
+        mime="application/octet-stream",
+    )
+    if writer.dataset_error is not None:
+        st.error(messages["dataset_error"].format(error=writer.dataset_error))
+    elif writer.dataset_root:
+        st.caption(messages["dataset_ok"].format(rows=writer.dataset_rows_written, path=writer.dataset_root))
@@ -2,7 +2,9 @@ import streamlit as st
 import os
 import re
 from datetime import datetime
-from scraper_service import get_transcript_by_url, extract_transcript_text
+from scraper_service import get_transcript_by_url, extract_transcript_text, detect_platform_from_url
+from export_service import EXPORT_ROOT, is_columnar_export_available
+from export_ui import finish_parquet_export, open_parquet_export, write_parquet_row
 import csv
 from io import StringIO
 
@@ -37,19 +39,37 @@ with st.expander("オプション設定", expanded=False):
     with col_opt3:
         max_retries = st.slider("最大リトライ回数", min_value=0, max_value=5, value=2)
     retry_wait_sec = st.slider("リトライ間隔(秒)", min_value=0.0, max_value=10.0, value=1.5, step=0.5)
+    export_parquet = st.checkbox(
+        "Parquetでもエクスポート",
+        value=False,
+        disabled=not is_columnar_export_available(),
+        help=None if is_columnar_export_available() else "pyarrow が未インストールだよ。",
+    )
+    parquet_dataset_name = st.text_input(
+        "Parquetデータセット名（任意・platform/fetch_date で分割）",
+        value="",
+        disabled=not export_parquet,
+        help=f"{EXPORT_ROOT} 配下に作成・追記するよ。",
+    )
 
 if st.button("一括文字起こしを実行"):
     urls = [u.strip() for u in bulk_urls_text.splitlines() if u.strip()]
+    parquet_writer = open_parquet_export(parquet_dataset_name) if urls and export_parquet else None
     if not urls:
         st.warning("URLを1つ以上入力してね。")
+    elif export_parquet and parquet_writer is None:
+        pass  # 準備エラーは open_parquet_export が表示済み
     else:
         progress = st.progress(0)
         status = st.empty()
         results = []
-        csv_rows = []  # URL, platform(not detected here), status, length
+        csv_rows = []  # URL, platform, status, length
 
         for idx, url in enumerate(urls):
+            platform = detect_platform_from_url(url) or ""
             status.text(f"({idx+1}/{len(urls)}) 取得中: {url[:80]}")
+            data = None
+            fetch_error = None
             try:
                 data = get_transcript_by_url(url, hl=hl, gl=gl, max_retries=max_retries, retry_wait_sec=retry_wait_sec)
                 transcript_text = extract_transcript_text(data) if isinstance(data, dict) else None
@@ -61,16 +81,19 @@ if st.button("一括文字起こしを実行"):
                         f"--- START TRANSCRIPT ---\n\n"
                     )
                     results.append(header + transcript_text + "\n\n")
-                    csv_rows.append([url, "", "OK", len(transcript_text)])
+                    csv_rows.append([url, platform, "OK", len(transcript_text)])
                 else:
                     results.append(f"URL: {url}\nERROR: Transcript not found or invalid response.\n\n")
-                    csv_rows.append([url, "", "ERROR", 0])
+                    csv_rows.append([url, platform, "ERROR", 0])
             except Exception as e:
+                fetch_error = str(e)
                 results.append(f"URL: {url}\nERROR: {e}\n\n")
-                csv_rows.append([url, "", "ERROR", 0])
+                csv_rows.append([url, platform, "ERROR", 0])
                 with st.expander("デバッグ：例外詳細", expanded=True):
                     st.write(url)
                     st.exception(e)
+            # 取得結果1件につきParquet1行（取得のtryとは分離）
+            parquet_writer = write_parquet_row(parquet_writer, url, data, error=fetch_error)
             progress.progress((idx+1)/len(urls))
 
         if results:
@@ -95,6 +118,11 @@ if st.button("一括文字起こしを実行"):
                 mime="text/csv",
             )
 
+            # Parquetダウンロード（データセット指定時はここで実行分をまとめて追記）
+            finish_parquet_export(
+                parquet_writer, re.sub(r'[\\/*?:"<>|]', "", custom_bulk_filename.replace('.txt', '.parquet'))
+            )
+
             with st.expander("デバッグ：処理ログと先頭プレビュー"):
                 st.text("\n".join([r[:200] for r in results[:3]]))
             with st.expander("デバッグ：処理ログと先頭プレビュー"):
@@ -1,6 +1,6 @@
 import os
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import requests
 from urllib.parse import quote
 import time
@@ -86,7 +86,7 @@ def get_channel_details(channel_id):
             error_message += f" | Status Code: {e.response.status_code} | Response: {e.response.text}"
         return error_message
 
-def _detect_platform_from_url(video_url: str):
+def detect_platform_from_url(video_url: str):
     """Return one of 'youtube', 'tiktok', 'instagram', or None based on URL."""
     if not isinstance(video_url, str) or not video_url:
         return None
@@ -100,6 +100,22 @@ def _detect_platform_from_url(video_url: str):
     return None
 
 
+def extract_video_id(video_url: str, platform: Optional[str] = None) -> Optional[str]:
+    """Return the platform-native video ID embedded in the URL, or None."""
+    if not isinstance(video_url, str) or not video_url:
+        return None
+    platform = platform or detect_platform_from_url(video_url)
+    if platform == "youtube":
+        match = re.search(r"(?:v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})", video_url)
+    elif platform == "tiktok":
+        match = re.search(r"/video/(\d+)", video_url)
+    elif platform == "instagram":
+        match = re.search(r"/(?:reel|reels|p|tv)/([A-Za-z0-9_-]+)", video_url)
+    else:
+        match = None
+    return match.group(1) if match else None
+
+
 def get_transcript_by_url(video_url: str, hl: str = "ja", gl: str = "JP", max_retries: int = 2, retry_wait_sec: float = 1.5):
     """
     Gets transcript for a given video URL across supported platforms
@@ -110,7 +126,7 @@ def get_transcript_by_url(video_url: str, hl: str = "ja", gl: str = "JP", max_re
     if not API_KEY:
         return "API key for Scrape Creators not found. Please set it in Streamlit Secrets or environment variable."
 
-    platform = _detect_platform_from_url(video_url)
+    platform = detect_platform_from_url(video_url)
     if platform is None:
         return f"Unsupported URL/platform: {video_url}"
 
@@ -162,20 +178,37 @@ def get_transcript(
     )
 
 
-def _flatten_text_list(items: List[Any]) -> str:
-    texts: List[str] = []
-    for it in items:
-        if isinstance(it, dict):
-            for key in ["text", "caption", "line"]:
-                if key in it and isinstance(it[key], str):
-                    texts.append(it[key])
-                    break
-        elif isinstance(it, str):
-            texts.append(it)
-    return "\n".join(t for t in texts if t)
+def _item_text(item: Any) -> Optional[str]:
+    if isinstance(item, dict):
+        for key in ["text", "caption", "line"]:
+            if isinstance(item.get(key), str):
+                return item[key]
+    elif isinstance(item, str):
+        return item
+    return None
 
 
-def extract_transcript_text(response: Any) -> Optional[str]:
+def _text_items(items: List[Any]) -> List[str]:
+    return [t for t in (_item_text(it) for it in items) if t]
+
+
+def _to_ms(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _locate_transcript(response: Any, allow_plain_text: bool = True) -> Union[str, List[Any], None]:
+    """
+    Finds the transcript inside an API response (absorbing shape differences
+    between platforms). Returns the plain text, the raw segment list, or None
+    when nothing usable is present.
+
+    With allow_plain_text=False the `transcript_only_text` shortcut is skipped,
+    so responses carrying both that and a segment list yield the list; a plain
+    string under the transcript keys still ends the search (no segments there).
+    """
     if not isinstance(response, dict):
         return None
 
@@ -187,37 +220,49 @@ def extract_transcript_text(response: Any) -> Optional[str]:
 
     # 1) direct plain text
     plain = payload.get("transcript_only_text")
-    if isinstance(plain, str) and plain.strip():
+    if allow_plain_text and isinstance(plain, str) and plain.strip():
         return plain.strip()
 
-    # 2) transcript variants
-    tr = payload.get("transcript")
-    if isinstance(tr, str) and tr.strip():
-        return tr.strip()
-    if isinstance(tr, list):
-        text = _flatten_text_list(tr)
-        return text if text.strip() else None
-    if isinstance(tr, dict):
-        for list_key in ["segments", "items", "events", "lines"]:
-            if isinstance(tr.get(list_key), list):
-                text = _flatten_text_list(tr[list_key])
-                if text.strip():
-                    return text
-
-    # 3) alternates
-    for alt in ["captions", "subtitles"]:
-        val = payload.get(alt)
+    # 2) transcript variants, then alternates
+    for key in ["transcript", "captions", "subtitles"]:
+        val = payload.get(key)
         if isinstance(val, str) and val.strip():
-            return val.strip()
-        if isinstance(val, list):
-            text = _flatten_text_list(val)
-            if text.strip():
-                return text
+            return val.strip() if allow_plain_text else None
+        candidates = [val] if isinstance(val, list) else []
         if isinstance(val, dict):
-            for list_key in ["segments", "items", "events", "lines"]:
-                if isinstance(val.get(list_key), list):
-                    text = _flatten_text_list(val[list_key])
-                    if text.strip():
-                        return text
+            candidates = [val[k] for k in ["segments", "items", "events", "lines"] if isinstance(val.get(k), list)]
+        for items in candidates:
+            if any(t.strip() for t in _text_items(items)):
+                return items
+
+    return None
+
 
-    return None
\ No newline at end of file
+def extract_transcript_text(response: Any) -> Optional[str]:
+    located = _locate_transcript(response)
+    if isinstance(located, list):
+        return "\n".join(_text_items(located))
+    return located
+
+
+def extract_transcript_segments(response: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    Returns the transcript segments as dicts with `text`, `start_ms` and
+    `end_ms` (None when the platform gives no timing), or None for plain-text
+    or unrecognized responses.
+    """
+    items = _locate_transcript(response, allow_plain_text=False)
+    if not isinstance(items, list):
+        return None
+    segments = []
+    for it in items:
+        text = _item_text(it)
+        if not text:
+            continue
+        timing = it if isinstance(it, dict) else {}
+        segments.append({
+            "text": text,
+            "start_ms": _to_ms(timing.get("startMs", timing.get("start_ms"))),
+            "end_ms": _to_ms(timing.get("endMs", timing.get("end_ms"))),
+        })
+    return segments
@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+import export_service
+from export_service import build_export_row, resolve_dataset_dir
+from scraper_service import extract_transcript_segments, extract_transcript_text
+
+YOUTUBE_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+YOUTUBE_RESPONSE = {
+    "transcript": [
+        {"text": "hi", "startMs": "0", "endMs": "1500", "startTimeText": "0:00"},
+        {"text": "there", "startMs": "1500", "endMs": "3000", "startTimeText": "0:01"},
+    ],
+    "transcript_only_text": "hi there",
+}
+
+
+def test_extract_transcript_segments_keeps_timing_alongside_plain_text():
+    assert extract_transcript_text(YOUTUBE_RESPONSE) == "hi there"
+    assert extract_transcript_segments(YOUTUBE_RESPONSE) == [
+        {"text": "hi", "start_ms": 0, "end_ms": 1500},
+        {"text": "there", "start_ms": 1500, "end_ms": 3000},
+    ]
+
+
+def test_extract_transcript_segments_without_timing_or_segments():
+    assert extract_transcript_segments({"data": {"captions": {"lines": ["a", ""]}}}) == [
+        {"text": "a", "start_ms": None, "end_ms": None}
+    ]
+    assert extract_transcript_segments({"transcript": "plain text"}) is None
+    assert extract_transcript_segments("API Error") is None
+
+
+def test_build_export_row_ok():
+    row = build_export_row(YOUTUBE_URL, YOUTUBE_RESPONSE, title="Title")
+    assert row["status"] == "OK"
+    assert row["error"] is None
+    assert row["video_id"] == "dQw4w9WgXcQ"
+    assert row["platform"] == "youtube"
+    assert row["transcript_text"] == "hi there"
+    assert len(row["transcript_segments"]) == 2
+    assert row["fetch_date"] == row["fetched_at"].strftime("%Y-%m-%d")
+
+
+def test_build_export_row_api_error_string():
+    row = build_export_row(YOUTUBE_URL, "API Error: 500")
+    assert row["status"] == "ERROR"
+    assert row["error"] == "API Error: 500"
+    assert row["transcript_text"] is None
+
+
+def test_build_export_row_exception_and_empty_response():
+    row = build_export_row(YOUTUBE_URL, None, error="network down")
+    assert (row["status"], row["error"]) == ("ERROR", "network down")
+
+    row = build_export_row(YOUTUBE_URL, {"unexpected": True})
+    assert (row["status"], row["error"]) == ("ERROR", "Transcript not found or invalid response.")
+
+
+@pytest.fixture
+def export_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_ROOT", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("name", ["..", "../outside", "a/../../b", "a\\..\\b", "/etc", os.path.abspath("x")])
+def test_resolve_dataset_dir_rejects_escapes(export_root, name):
+    with pytest.raises(ValueError):
+        resolve_dataset_dir(name)
+
+
+def test_resolve_dataset_dir(export_root):
+    assert resolve_dataset_dir("  ") is None
+    assert resolve_dataset_dir("team/videos") == os.path.join(os.path.realpath(export_root), "team", "videos")
+
+
+requires_pyarrow = pytest.mark.skipif(
+    not export_service.is_columnar_export_available(), reason="pyarrow is not installed"
+)
+
+
+def _read(data):
+    return export_service.pq.ParquetFile(export_service.pa.BufferReader(data))
+
+
+@requires_pyarrow
+def test_writer_row_groups_and_segments(export_root):
+    writer = export_service.ColumnarExportWriter(row_group_size=2)
+    for _ in range(5):
+        writer.write_row(build_export_row(YOUTUBE_URL, YOUTUBE_RESPONSE))
+    parquet_file = _read(writer.close())
+
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.num_rows == writer.rows_written == 5
+    assert table.column("transcript_segments")[0].as_py() == [
+        {"text": "hi", "start_ms": 0, "end_ms": 1500},
+        {"text": "there", "start_ms": 1500, "end_ms": 3000},
+    ]
+
+
+@requires_pyarrow
+def test_writer_never_rewrites_a_failed_batch(export_root):
+    writer = export_service.ColumnarExportWriter(row_group_size=2)
+    writer.write_row(build_export_row(YOUTUBE_URL, YOUTUBE_RESPONSE))
+    bad_row = dict(build_export_row(YOUTUBE_URL, YOUTUBE_RESPONSE), fetched_at="not a timestamp")
+    with pytest.raises(Exception):
+        writer.write_row(bad_row)
+    writer.write_row(build_export_row(YOUTUBE_URL, "API Error: 500"))
+
+    table = _read(writer.close()).read()
+    assert table.num_rows == 1
+    assert table.column("error").to_pylist() == ["API Error: 500"]
+
+
+@requires_pyarrow
+def test_writer_appends_whole_run_to_dataset(export_root):
+    for _ in range(2):
+        writer = export_service.ColumnarExportWriter(row_group_size=2, dataset_name="runs")
+        for _ in range(3):
+            writer.write_row(build_export_row(YOUTUBE_URL, YOUTUBE_RESPONSE))
+        writer.close()
+        assert writer.dataset_error is None
+        assert writer.dataset_rows_written == 3
+
+    partition_dirs = list((export_root / "runs" / "platform=youtube").iterdir())
+    assert len(partition_dirs) == 1
+    assert len(list(partition_dirs[0].iterdir())) == 2  # one file per run
+    assert export_service.pq.read_table(str(export_root / "runs")).num_rows == 6
+
+
+@requires_pyarrow
+def test_writer_keeps_dataset_error(export_root, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    writer = export_service.ColumnarExportWriter(dataset_name="runs")
+    writer.write_row(build_export_row(YOUTUBE_URL, YOUTUBE_RESPONSE))
+    monkeypatch.setattr(export_service.pq, "write_to_dataset", fail)
+    data = writer.close()
+
+    assert isinstance(writer.dataset_error, OSError)
+    assert writer.dataset_rows_written == 0
+    assert _read(data).read().num_rows == 1
@@ -0,0 +1,66 @@
+import pytest
+
+from video_records import parse_count_text, records_from_search_results
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1,234 views", 1234),
+        ("1 view", 1),
+        ("1.2M subscribers", 1_200_000),
+        ("123K subscribers", 123_000),
+        ("4.1M views", 4_100_000),
+        ("8.2M views", 8_200_000),
+        ("1 million views", 1_000_000),
+        ("2.5 thousand views", 2_500),
+        ("12万 回視聴", 120_000),
+        ("チャンネル登録者数 3.4万人", 34_000),
+        ("2.3億 回視聴", 230_000_000),
+        ("1.234.567 Aufrufe", 1_234_567),
+        ("5 bekeken", 5),
+        ("1.234 Aufrufe", 1234),
+        ("1,2K views", 1_200),
+        ("1,2 Mio. Aufrufe", None),
+        ("1.5 views", None),
+        ("12,34 views", None),
+        ("N/A", None),
+        ("No views", None),
+        (None, None),
+        (42, 42),
+    ],
+)
+def test_parse_count_text(text, expected):
+    assert parse_count_text(text) == expected
+
+
+def test_records_from_search_results_joins_subscribers():
+    search_results = {
+        "videos": [
+            {
+                "id": "abc",
+                "title": "Title",
+                "url": "https://www.youtube.com/watch?v=abc",
+                "channel": {"id": "ch1", "title": "Channel"},
+                "viewCountText": "1.5万 回視聴",
+                "publishedTimeText": "1 day ago",
+            },
+            {"id": "def", "channel": "unexpected"},
+            "not a dict",
+        ],
+        "channels": [{"id": "ch1", "subscriberCountText": "1.2M subscribers"}],
+    }
+
+    records = records_from_search_results(search_results)
+
+    assert [r.video_id for r in records] == ["abc", "def"]
+    first, second = records
+    assert first.channel_title == "Channel"
+    assert first.subscriber_count_text == "1.2M subscribers"
+    assert first.subscriber_count == 1_200_000
+    assert first.view_count == 15_000
+    assert second.title == "No Title"
+    assert second.subscriber_count_text == "N/A"
+    assert second.subscriber_count is None
+    assert not hasattr(first, "__dict__")
+    assert not hasattr(first, "channel_id")
@@ -0,0 +1,137 @@
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+
+_COUNT_RE = re.compile(
+    r"(\d+(?:[.,]\d+)*)\s*(thousand|million|billion|[KMB](?![A-Za-z])|[千万億])?",
+    re.IGNORECASE,
+)
+# Plain integer, or digits grouped in threes by a consistent "," / "." separator
+_GROUPED_INT_RE = re.compile(r"\d+|\d{1,3}([.,])\d{3}(?:\1\d{3})*")
+# "1,2" style decimal comma before a suffix (e.g. "1,2K")
+_DECIMAL_COMMA_RE = re.compile(r"\d+,\d{1,2}")
+_COUNT_MULTIPLIERS = {
+    "": 1,
+    "k": 1_000,
+    "m": 1_000_000,
+    "b": 1_000_000_000,
+    "thousand": 1_000,
+    "million": 1_000_000,
+    "billion": 1_000_000_000,
+    "千": 1_000,
+    "万": 10_000,
+    "億": 100_000_000,
+}
+
+
+def parse_count_text(text: Any) -> Optional[int]:
+    """
+    Parses display counts such as "1,234 views", "1.2M subscribers",
+    "1 million views", "12万 回視聴" or "チャンネル登録者数 3.4万人" into an integer.
+    Returns None when no number is present (e.g. "N/A", "No views") or when a
+    decimal number has no recognised unit (e.g. "1,2 Mio. Aufrufe", "1.5 views"),
+    rather than guessing.
+    """
+    if isinstance(text, int):
+        return text
+    if not isinstance(text, str):
+        return None
+    match = _COUNT_RE.search(text)
+    if not match:
+        return None
+    number, suffix = match.groups()
+    multiplier = _COUNT_MULTIPLIERS[(suffix or "").lower()]
+    if multiplier == 1:
+        if not _GROUPED_INT_RE.fullmatch(number):
+            return None
+        return int(re.sub(r"[.,]", "", number))
+    if _DECIMAL_COMMA_RE.fullmatch(number):
+        number = number.replace(",", ".")
+    # Decimal avoids float truncation (e.g. "4.1M" -> 4099999)
+    try:
+        return int(Decimal(number.replace(",", "")) * multiplier)
+    except InvalidOperation:
+        return None
+
+
+class VideoRecord:
+    """
+    Compact view of a search-result video holding only the fields the app
+    uses. Counts are parsed once so sorting/filtering never re-reads the
+    display text.
+    """
+
+    __slots__ = (
+        "video_id",
+        "title",
+        "url",
+        "thumbnail",
+        "channel_title",
+        "subscriber_count_text",
+        "subscriber_count",
+        "view_count_text",
+        "view_count",
+        "published_time_text",
+    )
+
+    def __init__(
+        self,
+        video_id: Optional[str],
+        title: str,
+        url: str,
+        thumbnail: Optional[str],
+        channel_title: str,
+        subscriber_count_text: str,
+        view_count_text: str,
+        published_time_text: str,
+    ):
+        self.video_id = video_id
+        self.title = title
+        self.url = url
+        self.thumbnail = thumbnail
+        self.channel_title = channel_title
+        self.subscriber_count_text = subscriber_count_text
+        self.subscriber_count = parse_count_text(subscriber_count_text)
+        self.view_count_text = view_count_text
+        self.view_count = parse_count_text(view_count_text)
+        self.published_time_text = published_time_text
+
+    def __repr__(self):
+        return f"VideoRecord(video_id={self.video_id!r}, title={self.title!r})"
+
+    @classmethod
+    def from_api(cls, video: Dict[str, Any], subscriber_count_text: str = "N/A") -> "VideoRecord":
+        channel = video.get("channel")
+        if not isinstance(channel, dict):
+            channel = {}
+        thumbnail = video.get("thumbnail")
+        return cls(
+            video_id=video.get("id"),
+            title=video.get("title") or "No Title",
+            url=video.get("url") or "#",
+            thumbnail=thumbnail if isinstance(thumbnail, str) and thumbnail else None,
+            channel_title=channel.get("title") or "N/A",
+            subscriber_count_text=subscriber_count_text or "N/A",
+            view_count_text=video.get("viewCountText") or "N/A",
+            published_time_text=video.get("publishedTimeText") or "N/A",
+        )
+
+
+def records_from_search_results(search_results: Dict[str, Any]) -> List[VideoRecord]:
+    """Builds VideoRecords from a search_youtube() response, joining channel subscriber counts."""
+    video_list = search_results.get("videos") or []
+    channel_list = search_results.get("channels") or []
+
+    # チャンネルIDをキーとして購読者数を持つ辞書（ルックアップテーブル）を作成
+    channel_subscribers = {
+        c.get("id"): c.get("subscriberCountText", "N/A") for c in channel_list if isinstance(c, dict)
+    }
+
+    records = []
+    for video in video_list:
+        if not isinstance(video, dict):
+            continue
+        channel = video.get("channel")
+        channel_id = channel.get("id") if isinstance(channel, dict) else None
+        records.append(VideoRecord.from_api(video, channel_subscribers.get(channel_id, "N/A")))
+    return records